@@ -22,7 +22,8 @@ import argparse
 import json
 import sys
 import threading
-from datetime import datetime
+import time
+from collections import deque
 from pathlib import Path
 from typing import Optional
 
@@ -46,8 +47,6 @@ try:
 except ImportError:
     RICH_AVAILABLE = False
 
-import onnx_asr
-
 from src.audio_devices import (
     list_audio_devices,
     get_device_by_name,
@@ -55,12 +54,17 @@ from src.audio_devices import (
     validate_device,
     get_device_info,
 )
-from src.realtime_asr import RealtimeASR
+from src.realtime_asr import RealtimeASR, ASREvent
+from src.ui.console import simple_level_bar
 
 
 # Путь к конфигу
 CONFIG_PATH = Path(__file__).parent / "config.json"
 
+# Пауза циклов опроса: одно никогда не устанавливаемое событие на весь процесс
+# вместо нового Event (с Condition и блокировкой) на каждой итерации
+_IDLE = threading.Event()
+
 
 def load_config() -> dict:
     """
@@ -115,7 +119,6 @@ def run_codex_thread(query: str, ui):
     """Фоновая функция для выполнения запроса Codex и обновления UI."""
     import subprocess
     import shutil
-    import time
     
     ui.update_codex("", status="Генерация...", append=False)
     ui.update_codex(f"> {query}\n\n", append=True)
@@ -140,9 +143,8 @@ def run_codex_thread(query: str, ui):
         # Читаем вывод построчно, чтобы сразу отображать прогресс
         if process.stdout:
             for line in process.stdout:
+                # Без пауз: UI сам сводит частые обновления в один кадр
                 ui.update_codex(line, append=True)
-                # Небольшая пауза, чтобы не перегружать UI
-                time.sleep(0.05)
 
         retcode = process.wait()
         if retcode != 0:
@@ -158,7 +160,6 @@ def run_codex_fast_thread(query: str, ui, model: str = "gpt-5.1", reasoning: str
     """Фоновая функция для выполнения быстрого Codex (low reasoning) и обновления UI."""
     import subprocess
     import shutil
-    import time
     
     ui.update_codex_fast("", status="⚡ Генерация...", append=False)
     ui.update_codex_fast(f"> {query}\n\n", append=True)
@@ -192,7 +193,6 @@ def run_codex_fast_thread(query: str, ui, model: str = "gpt-5.1", reasoning: str
         if process.stdout:
             for line in process.stdout:
                 ui.update_codex_fast(line, append=True)
-                time.sleep(0.03)
 
         retcode = process.wait()
         if retcode != 0:
@@ -308,7 +308,7 @@ def select_device_interactive(ui) -> Optional[int]:
             ui.print_error("Аудиоустройства не найдены!")
             return None
         
-        selector = DeviceSelector()
+        selector = DeviceSelector(console=ui.console)
         return selector.select_device(devices_tuple)
     else:
         # Fallback: текстовый выбор
@@ -327,28 +327,16 @@ def select_device_interactive(ui) -> Optional[int]:
 
 def run_continuous_mode(asr: RealtimeASR, device_id, output_file, accumulate: bool, ui):
     """Запуск в непрерывном режиме с Rich UI."""
+    # Последний частичный результат: поток ASR только кладёт его сюда,
+    # а UI забирает раз в тик (промежуточные результаты схлопываются)
+    latest_result = deque(maxlen=1)
     
     def on_result(text: str):
-        level = asr.get_audio_level()
-        
-        # В режиме накопления показываем весь текст
-        accumulated = ""
-        if accumulate:
-            full_text = asr.get_accumulated_text()
-            if full_text:
-                accumulated = full_text
-        
-        # Обновляем UI
-        ui.update(
-            text=text,
-            level=level,
-            recording=True,
-            accumulated=accumulated
-        )
+        latest_result.append(text)
         
         # Записываем в файл
         if output_file:
-            timestamp = datetime.now().strftime("%H:%M:%S")
+            timestamp = time.strftime("%H:%M:%S")
             output_file.write(f"[{timestamp}] {text}\n")
             output_file.flush()
     
@@ -364,8 +352,22 @@ def run_continuous_mode(asr: RealtimeASR, device_id, output_file, accumulate: bo
         while True:
             # Периодически обновляем уровень звука (100мс для плавности без мерцания)
             level = asr.get_audio_level()
-            ui.update(level=level, recording=True)
-            threading.Event().wait(0.1)
+            
+            try:
+                text = latest_result.pop()
+            except IndexError:
+                ui.update(level=level, recording=True)
+            else:
+                # В режиме накопления показываем весь текст
+                accumulated = asr.get_accumulated_text() if accumulate else ""
+                ui.update(
+                    text=text,
+                    level=level,
+                    recording=True,
+                    accumulated=accumulated
+                )
+            
+            _IDLE.wait(0.1)
             
     except KeyboardInterrupt:
         pass
@@ -380,14 +382,9 @@ def run_continuous_mode_simple(asr: RealtimeASR, device_id, output_file, accumul
     def on_result(text: str):
         nonlocal last_line_len
         
-        # Очищаем предыдущую строку
-        clear_str = " " * last_line_len
-        print(f"\r{clear_str}", end="")
-        
         # Формируем вывод
         level = asr.get_audio_level()
-        bars = int(level * 30)
-        level_str = "▓" * min(bars, 10) + "░" * max(0, 10 - bars)
+        level_str = simple_level_bar(int(level * 30))
         
         # В режиме накопления показываем весь текст
         if accumulate:
@@ -400,13 +397,15 @@ def run_continuous_mode_simple(asr: RealtimeASR, device_id, output_file, accumul
             display_text = text
         
         output = f"🎤 [{level_str}] {display_text}"
-        last_line_len = len(output) + 10
         
-        print(f"\r{output}", end="", flush=True)
+        # Одна запись поверх предыдущей строки: хвост старой строки затирается
+        # пробелами дополнения, без отдельного прохода очистки
+        print(f"\r{output:<{last_line_len}}", end="", flush=True)
+        last_line_len = len(output) + 10
         
         # Записываем в файл
         if output_file:
-            timestamp = datetime.now().strftime("%H:%M:%S")
+            timestamp = time.strftime("%H:%M:%S")
             output_file.write(f"[{timestamp}] {text}\n")
             output_file.flush()
     
@@ -417,7 +416,7 @@ def run_continuous_mode_simple(asr: RealtimeASR, device_id, output_file, accumul
         
         # Бесконечный цикл ожидания
         while True:
-            threading.Event().wait(1)
+            _IDLE.wait(1)
             
     except KeyboardInterrupt:
         pass
@@ -453,12 +452,17 @@ def run_push_to_talk_mode(
     
     # Состояние
     is_recording = False
-    segments: list = []
     
     # Нормализуем имя клавиши
     key_name = ptt_key.lower()
     was_pressed = False
     
+    def commit_segment(text: str) -> bool:
+        """Сохраняет сегмент и копирует его в буфер обмена (единый путь)."""
+        # Хранилище сегментов — ограниченная история UI (ui.segments)
+        ui.add_segment(text)
+        return copy_to_clipboard(text)
+    
     try:
         # Запускаем ASR (но не записываем сразу)
         asr.recording = False
@@ -477,33 +481,33 @@ def run_push_to_talk_mode(
             # Прокрутка панели Codex стрелками
             if keyboard.is_pressed('up'):
                 ui.scroll_codex_up(3)
-                threading.Event().wait(0.15)  # Debounce
+                _IDLE.wait(0.15)  # Debounce
             elif keyboard.is_pressed('down'):
                 ui.scroll_codex_down(3)
-                threading.Event().wait(0.15)
+                _IDLE.wait(0.15)
             elif keyboard.is_pressed('page up'):
                 ui.scroll_codex_up(10)
-                threading.Event().wait(0.15)
+                _IDLE.wait(0.15)
             elif keyboard.is_pressed('page down'):
                 ui.scroll_codex_down(10)
-                threading.Event().wait(0.15)
+                _IDLE.wait(0.15)
             elif keyboard.is_pressed('home'):
                 ui.scroll_codex_to_top()
-                threading.Event().wait(0.15)
+                _IDLE.wait(0.15)
             elif keyboard.is_pressed('end'):
                 ui.scroll_codex_to_bottom()
-                threading.Event().wait(0.15)
+                _IDLE.wait(0.15)
             
             # Изменение размера панелей (+/- или =/-)
             elif keyboard.is_pressed('+') or keyboard.is_pressed('='):
                 ui.increase_panel_size(2)
-                threading.Event().wait(0.2)
+                _IDLE.wait(0.2)
             elif keyboard.is_pressed('-'):
                 ui.decrease_panel_size(2)
-                threading.Event().wait(0.2)
+                _IDLE.wait(0.2)
             elif keyboard.is_pressed('0'):
                 ui.reset_panel_size()
-                threading.Event().wait(0.2)
+                _IDLE.wait(0.2)
             
             # Проверяем состояние PTT клавиши
             is_key_pressed = keyboard.is_pressed(key_name)
@@ -528,11 +532,8 @@ def run_push_to_talk_mode(
                 ui.update(recording=False)
                 
                 if text:
-                    segments.append(text)
-                    ui.add_segment(text)
-                    
-                    # Копируем в буфер обмена
-                    copied = copy_to_clipboard(text)
+                    # Сохраняем и копируем в буфер обмена
+                    copied = commit_segment(text)
                     
                     # Запускаем быстрый codex (если включено)
                     fast_launched = False
@@ -557,11 +558,11 @@ def run_push_to_talk_mode(
                     
                     # Записываем в файл
                     if output_file:
-                        timestamp = datetime.now().strftime("%H:%M:%S")
+                        timestamp = time.strftime("%H:%M:%S")
                         output_file.write(f"[{timestamp}] {text}\n")
                         output_file.flush()
             
-            threading.Event().wait(0.1)  # Увеличено до 100мс для стабильности
+            _IDLE.wait(0.1)  # Увеличено до 100мс для стабильности
             
     except KeyboardInterrupt:
         pass
@@ -572,20 +573,22 @@ def run_push_to_talk_mode(
         if is_recording:
             text = asr.stop_recording()
             if text:
-                segments.append(text)
-                ui.add_segment(text)
-                copied = copy_to_clipboard(text)
+                copied = commit_segment(text)
                 ui.print_segment(text, copied=copied)
     
-    # Выводим полный текст
-    if segments:
-        ui.segments = [(datetime.now().strftime("%H:%M:%S"), s) for s in segments]
+    # Выводим полный текст (с настоящими временными метками сегментов)
+    if ui.segments:
         ui.print_final_transcript()
         
-        # Сохраняем полный текст
+        # Сохраняем полный текст; каждый сегмент уже записан в файл построчно,
+        # поэтому при переполнении истории итог честно помечается как неполный
         if output_file:
-            full_text = " ".join(segments)
-            output_file.write(f"\n--- ПОЛНАЯ ТРАНСКРИПЦИЯ ---\n{full_text}\n")
+            full_text = " ".join(t for _, t in ui.segments)
+            if ui.segments_dropped:
+                header = f"ТРАНСКРИПЦИЯ (последние {len(ui.segments)} сегментов)"
+            else:
+                header = "ПОЛНАЯ ТРАНСКРИПЦИЯ"
+            output_file.write(f"\n--- {header} ---\n{full_text}\n")
 
 
 def main():
@@ -740,7 +743,7 @@ def main():
             devices_tuple = list_audio_devices(show_output=False)
             input_devices, output_devices = devices_tuple
             if input_devices:
-                selector = DeviceSelector()
+                selector = DeviceSelector(console=ui.console)
                 # Просто показываем таблицу без выбора
                 selector.select_device(devices_tuple, title="Доступные устройства")
             else:
@@ -804,9 +807,11 @@ def main():
             ui.print_error(f"Ошибка открытия файла: {e}")
             return 1
     
-    # Загружаем модель
+    # Загружаем модель (onnx_asr импортируется только здесь: --list-devices,
+    # выбор устройства и ошибки аргументов не платят за тяжёлый импорт)
     ui.print_info(f"Загрузка модели {args.model}...")
     try:
+        import onnx_asr
         model = onnx_asr.load_model(args.model)
     except Exception as e:
         ui.print_error(f"Ошибка загрузки модели: {e}")
@@ -825,6 +830,16 @@ def main():
         accumulate_mode=use_accumulate,
     )
     
+    def on_asr_event(tag, payload):
+        if tag == ASREvent.ERROR:
+            ui.print_warning(f"ASR Error: {payload}")
+        elif tag == ASREvent.STATUS:
+            status, count = payload
+            suffix = f" (x{count})" if count > 1 else ""
+            ui.print_warning(f"Audio: {status}{suffix}")
+    
+    asr.on_event = on_asr_event
+    
     # Показываем статус
     mode = "push_to_talk" if args.push_to_talk else "continuous"
     ui.print_status(
@@ -1,10 +1,11 @@
 """GigaAM Realtime ASR - модули для распознавания речи в реальном времени."""
 
-from .realtime_asr import RealtimeASR
+from .realtime_asr import RealtimeASR, ASREvent
 from .audio_devices import list_audio_devices, get_device_by_name, get_loopback_device
 
 __all__ = [
     'RealtimeASR',
+    'ASREvent',
     'list_audio_devices',
     'get_device_by_name',
     'get_loopback_device',
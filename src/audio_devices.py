@@ -3,20 +3,61 @@
 import sounddevice as sd
 from typing import Optional, Tuple, List
 
+# Ключевые слова в именах loopback-устройств (захват системного звука)
+LOOPBACK_KEYWORDS = (
+    'loopback',
+    'stereo mix',
+    'what u hear',
+    'record what you hear',
+    'wave out',
+    'wasapi',
+)
 
-def list_audio_devices(show_output: bool = False) -> Tuple[List[Tuple[int, str, int]], List[Tuple[int, str, int]]]:
+
+def is_loopback_name(name: str) -> bool:
+    """
+    Проверяет, похоже ли имя устройства на loopback (Stereo Mix и т.п.).
+    
+    Args:
+        name: Имя устройства
+        
+    Returns:
+        True, если имя содержит одно из LOOPBACK_KEYWORDS
+    """
+    name_lower = name.lower()
+    return any(keyword in name_lower for keyword in LOOPBACK_KEYWORDS)
+
+
+# Кэш перечисления устройств (опрос PortAudio синхронный и небыстрый)
+_devices_cache = None
+
+
+def _query_devices(refresh: bool = False):
+    """
+    Возвращает список устройств PortAudio, опрашивая его не чаще одного раза за сессию.
+    
+    Args:
+        refresh: Если True, принудительно перечитывает список устройств
+    """
+    global _devices_cache
+    if _devices_cache is None or refresh:
+        _devices_cache = sd.query_devices()
+    return _devices_cache
+
+
+def list_audio_devices(show_output: bool = False, refresh: bool = False) -> Tuple[List[Tuple[int, str, int]], List[Tuple[int, str, int]]]:
     """
     Получает список доступных аудиоустройств.
     
     Args:
         show_output: Если True, выводит список в консоль
+        refresh: Если True, заново перечисляет устройства вместо кэша
         
     Returns:
         Кортеж (input_devices, output_devices), где каждый элемент —
         список кортежей (индекс, имя, количество каналов)
     """
-    devices = sd.query_devices()
-    default_input, default_output = sd.default.device
+    devices = _query_devices(refresh)
     
     input_devices = []
     output_devices = []
@@ -32,25 +73,35 @@ def list_audio_devices(show_output: bool = False) -> Tuple[List[Tuple[int, str,
             output_devices.append((idx, name, max_out))
     
     if show_output:
-        print("\n" + "=" * 50)
-        print("📋 ДОСТУПНЫЕ АУДИОУСТРОЙСТВА")
-        print("=" * 50)
+        default_input, default_output = sd.default.device
         
-        print("\n📥 УСТРОЙСТВА ВВОДА (Микрофоны):")
-        print("-" * 40)
+        # Список собирается целиком и выводится одной записью, а не print на строку
+        lines = [
+            "",
+            "=" * 50,
+            "📋 ДОСТУПНЫЕ АУДИОУСТРОЙСТВА",
+            "=" * 50,
+            "",
+            "📥 УСТРОЙСТВА ВВОДА (Микрофоны):",
+            "-" * 40,
+        ]
         for idx, name, channels in input_devices:
             default_mark = " ⭐ (по умолчанию)" if idx == default_input else ""
-            print(f"  [{idx:2d}] 🎤 {name} ({channels} кан.){default_mark}")
+            lines.append(f"  [{idx:2d}] 🎤 {name} ({channels} кан.){default_mark}")
         
-        print("\n📤 УСТРОЙСТВА ВЫВОДА (Динамики/Наушники):")
-        print("-" * 40)
+        lines += ["", "📤 УСТРОЙСТВА ВЫВОДА (Динамики/Наушники):", "-" * 40]
         for idx, name, channels in output_devices:
             default_mark = " ⭐ (по умолчанию)" if idx == default_output else ""
-            print(f"  [{idx:2d}] 🔊 {name} ({channels} кан.){default_mark}")
+            lines.append(f"  [{idx:2d}] 🔊 {name} ({channels} кан.){default_mark}")
         
-        print("\n" + "=" * 50)
-        print("💡 Используйте --device <ID> для выбора устройства")
-        print("=" * 50 + "\n")
+        lines += [
+            "",
+            "=" * 50,
+            "💡 Используйте --device <ID> для выбора устройства",
+            "=" * 50,
+            "",
+        ]
+        print("\n".join(lines))
     
     return input_devices, output_devices
 
@@ -65,7 +116,7 @@ def get_device_by_name(name_pattern: str) -> Optional[int]:
     Returns:
         Индекс устройства или None, если не найдено
     """
-    devices = sd.query_devices()
+    devices = _query_devices()
     name_lower = name_pattern.lower()
     
     for idx, device in enumerate(devices):
@@ -83,25 +134,12 @@ def get_loopback_device() -> Tuple[Optional[int], Optional[str]]:
     Returns:
         Кортеж (индекс, имя) устройства или (None, None), если не найдено
     """
-    devices = sd.query_devices()
-    
-    # Ключевые слова для поиска loopback устройств
-    loopback_keywords = [
-        'loopback',
-        'stereo mix',
-        'what u hear',
-        'wave out mix',
-        'record what you hear',
-        'wasapi',
-    ]
+    devices = _query_devices()
     
     for idx, device in enumerate(devices):
-        name_lower = device['name'].lower()
         # Ищем среди устройств ввода
-        if device['max_input_channels'] > 0:
-            for keyword in loopback_keywords:
-                if keyword in name_lower:
-                    return idx, device['name']
+        if device['max_input_channels'] > 0 and is_loopback_name(device['name']):
+            return idx, device['name']
     
     return None, None
 
@@ -116,10 +154,14 @@ def get_device_info(device_id: int) -> Optional[dict]:
     Returns:
         Словарь с информацией об устройстве или None
     """
+    # Индекс в кэшированном списке вместо повторного опроса PortAudio
     try:
-        return sd.query_devices(device_id)
+        devices = _query_devices()
     except Exception:
         return None
+    if isinstance(device_id, int) and 0 <= device_id < len(devices):
+        return devices[device_id]
+    return None
 
 
 def validate_device(device_id: int) -> Tuple[bool, str]:
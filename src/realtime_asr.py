@@ -3,9 +3,20 @@
 import numpy as np
 import sounddevice as sd
 import threading
+import math
 import sys
-from collections import deque
-from typing import Optional, Callable, List
+from typing import Optional, Callable, List, Any
+
+
+# Готовые индикаторы уровня для вывода по умолчанию: 0–10 делений, дополненные до ширины
+_LEVEL_INDICATORS = tuple(("█" * i).ljust(10) for i in range(11))
+
+
+class ASREvent:
+    """Теги редких событий RealtimeASR, передаваемых в on_event(tag, payload)."""
+    SEGMENT = 1  # payload: финальный текст сегмента (str)
+    ERROR = 2    # payload: исключение распознавания (Exception)
+    STATUS = 3   # payload: (статус аудиопотока, число повторов с прошлого отчёта)
 
 
 class RealtimeASR:
@@ -50,8 +61,13 @@ class RealtimeASR:
         self.vad_threshold = vad_threshold
         self.accumulate_mode = accumulate_mode
         
-        # Кольцевой буфер для аудио данных
-        self.buffer = deque(maxlen=int(sample_rate * buffer_seconds))
+        # Кольцевой буфер для аудио данных (выделяется один раз и переиспользуется
+        # между start/stop, без поэлементного хранения float-объектов)
+        self._buffer_capacity = max(1, int(sample_rate * buffer_seconds))
+        self.buffer = np.zeros(self._buffer_capacity, dtype=np.float32)
+        self._buffer_pos = 0  # Позиция следующей записи
+        self._buffer_len = 0  # Количество валидных сэмплов
+        self._samples_written = 0  # Всего записано сэмплов (счётчик новых данных)
         # Буфер накопления аудио (для режима accumulate)
         self.accumulated_audio: List[np.ndarray] = []
         self.lock = threading.Lock()
@@ -62,61 +78,123 @@ class RealtimeASR:
         self.recording = True  # Для push-to-talk
         self.last_text = ""
         self.stream: Optional[sd.InputStream] = None
+        self._device: Optional[int] = None  # Устройство текущего аудиопотока
         self.process_thread: Optional[threading.Thread] = None
+        # Событие остановки: будит поток обработки сразу, а не через тик ожидания
+        self._stop_event = threading.Event()
         
         # Накопленный текст (для режима accumulate)
         self.accumulated_text: List[str] = []
+        # Готовая склейка сегментов: дополняется при добавлении, а не пересобирается при чтении
+        self._accumulated_joined = ""
         
-        # Callback для результатов
+        # Callback для результатов (частый путь — отдельный callback)
         self.on_result: Optional[Callable[[str], None]] = None
-        self.on_segment_complete: Optional[Callable[[str], None]] = None
+        # Редкие события (сегменты, ошибки) — один диспетчер с тегом ASREvent
+        self.on_event: Optional[Callable[[int, Any], None]] = None
         
         # Статистика
         self.audio_level = 0.0
         self.is_speech = False
+        # Кольцо последних уровней: callback только пишет в ячейку,
+        # а UI читает максимум (пиковый индикатор без блокировок)
+        self._level_ring = np.zeros(4, dtype=np.float32)
+        self._level_index = 0
+        
+        # Статусы аудиопотока (xrun и т.п.): callback только отмечает их,
+        # а сообщение печатает поток обработки — не чаще одного за итерацию.
+        # Счётчик монотонный и пишется только callback'ом; поток обработки
+        # хранит своё «уже сообщено», так что у каждого поля один писатель
+        self._audio_status = None
+        self._audio_status_count = 0
+        self._audio_status_reported = 0
+    
+    def _buffer_write(self, chunk: np.ndarray):
+        """Записывает чанк в кольцевой буфер (вызывать под self.lock)."""
+        capacity = self._buffer_capacity
+        n = len(chunk)
+        self._samples_written += n
+        if n >= capacity:
+            self.buffer[:] = chunk[-capacity:]
+            self._buffer_pos = 0
+            self._buffer_len = capacity
+            return
+        
+        end = self._buffer_pos + n
+        if end <= capacity:
+            self.buffer[self._buffer_pos:end] = chunk
+        else:
+            split = capacity - self._buffer_pos
+            self.buffer[self._buffer_pos:] = chunk[:split]
+            self.buffer[:end - capacity] = chunk[split:]
+        self._buffer_pos = end % capacity
+        self._buffer_len = min(capacity, self._buffer_len + n)
+    
+    def _buffer_read(self) -> np.ndarray:
+        """Возвращает копию буфера в хронологическом порядке (вызывать под self.lock)."""
+        if self._buffer_len < self._buffer_capacity:
+            return self.buffer[:self._buffer_len].copy()
+        return np.concatenate((self.buffer[self._buffer_pos:], self.buffer[:self._buffer_pos]))
+    
+    def _buffer_clear(self):
+        """Очищает кольцевой буфер без перевыделения памяти (вызывать под self.lock)."""
+        self._buffer_pos = 0
+        self._buffer_len = 0
+        # Пиковый уровень прошлой сессии/устройства не должен показываться после сброса
+        self._level_ring.fill(0.0)
     
     def _audio_callback(self, indata, frames, time_info, status):
         """Callback вызывается sounddevice при получении аудио."""
         if status:
-            print(f"\n⚠️ Audio: {status}", file=sys.stderr)
+            # Никакого I/O в realtime-потоке — только флаг
+            self._audio_status = status
+            self._audio_status_count += 1
         
         audio_chunk = indata[:, 0].copy()
         
-        # Вычисляем уровень звука (RMS)
-        self.audio_level = np.sqrt(np.mean(audio_chunk ** 2))
+        # Вычисляем уровень звука (RMS) одним скалярным произведением:
+        # без временного массива квадратов на каждый блок
+        self.audio_level = math.sqrt(float(np.dot(audio_chunk, audio_chunk)) / max(1, len(audio_chunk)))
+        self._level_ring[self._level_index & 3] = self.audio_level
+        self._level_index += 1
         
-        # VAD: определяем наличие речи
-        if self.vad_threshold > 0:
-            self.is_speech = self.audio_level > self.vad_threshold
-        else:
-            self.is_speech = True
+        # VAD: одно сравнение без ветвления (при выключенном VAD порог ниже любого уровня)
+        self.is_speech = self.audio_level > self._vad_gate
         
         # Добавляем в буфер только если запись активна
         if self.recording:
             with self.lock:
-                self.buffer.extend(audio_chunk)
+                self._buffer_write(audio_chunk)
                 # В режиме накопления сохраняем все чанки
                 if self.accumulate_mode:
                     self.accumulated_audio.append(audio_chunk)
     
     def _process_loop(self):
         """Цикл обработки аудио в отдельном потоке."""
+        # Отметка буфера, по которому уже было распознавание: без новых данных
+        # повторный прогон модели дал бы тот же результат
+        recognized_at = -1
+        
         while self.running:
+            self._report_audio_status()
+            
             if self.paused or not self.recording:
-                threading.Event().wait(0.1)
+                self._stop_event.wait(0.1)
                 continue
             
             audio = None
             with self.lock:
-                if len(self.buffer) >= self.min_samples:
-                    audio = np.array(list(self.buffer), dtype=np.float32)
+                if self._buffer_len >= self.min_samples and self._samples_written != recognized_at:
+                    audio = self._buffer_read()
+                    written = self._samples_written
             
             if audio is not None:
                 # Если VAD включён и нет речи — пропускаем
                 if self.vad_threshold > 0 and not self.is_speech:
-                    threading.Event().wait(0.1)
+                    self._stop_event.wait(0.1)
                     continue
                 
+                recognized_at = written
                 try:
                     text = self.model.recognize(audio, sample_rate=self.sample_rate)
                     if text and text != self.last_text:
@@ -128,18 +206,37 @@ class RealtimeASR:
                             # Вывод по умолчанию
                             self._default_output(text)
                 except Exception as e:
-                    print(f"\n⚠️ ASR Error: {e}", file=sys.stderr)
+                    self._emit(ASREvent.ERROR, e)
             
             # Небольшая пауза между итерациями
-            threading.Event().wait(0.1)
+            self._stop_event.wait(0.1)
+    
+    def _report_audio_status(self):
+        """Выводит накопленные статусы аудиопотока одним сообщением."""
+        total = self._audio_status_count
+        count = total - self._audio_status_reported
+        if not count:
+            return
+        self._audio_status_reported = total
+        self._emit(ASREvent.STATUS, (self._audio_status, count))
+    
+    def _emit(self, tag: int, payload: Any):
+        """Передаёт редкое событие в on_event (без обработчика ошибки и статусы — в stderr)."""
+        if self.on_event:
+            self.on_event(tag, payload)
+        elif tag == ASREvent.ERROR:
+            print(f"\n⚠️ ASR Error: {payload}", file=sys.stderr)
+        elif tag == ASREvent.STATUS:
+            status, count = payload
+            suffix = f" (x{count})" if count > 1 else ""
+            print(f"\n⚠️ Audio: {status}{suffix}", file=sys.stderr)
     
     def _default_output(self, text: str):
         """Вывод результата по умолчанию."""
         # Индикатор уровня звука
-        level_bars = int(self.audio_level * 50)
-        level_indicator = "█" * min(level_bars, 10)
+        level_indicator = _LEVEL_INDICATORS[max(0, min(10, int(self.audio_level * 50)))]
         
-        print(f"\r🎤 [{level_indicator:<10}] {text}    ", end="", flush=True)
+        print(f"\r🎤 [{level_indicator}] {text}    ", end="", flush=True)
     
     def start(self, device: Optional[int] = None):
         """
@@ -155,9 +252,19 @@ class RealtimeASR:
         self.running = True
         self.paused = False
         self.recording = True
+        self._stop_event.clear()
+        self._level_ring.fill(0.0)
         
         # Создаём аудио поток
-        self.stream = sd.InputStream(
+        self._open_stream(device)
+        
+        # Запускаем обработку в отдельном потоке
+        self.process_thread = threading.Thread(target=self._process_loop, daemon=True)
+        self.process_thread.start()
+    
+    def _open_stream(self, device: Optional[int]):
+        """Создаёт и запускает входной аудиопоток на указанном устройстве."""
+        stream = sd.InputStream(
             device=device,
             channels=1,
             samplerate=self.sample_rate,
@@ -165,20 +272,61 @@ class RealtimeASR:
             callback=self._audio_callback,
             blocksize=int(self.sample_rate * 0.1),  # 100ms блоки
         )
-        self.stream.start()
+        try:
+            stream.start()
+        except Exception:
+            stream.close()
+            raise
+        self.stream = stream
+        self._device = device
+    
+    def _close_stream(self):
+        """Останавливает и закрывает текущий аудиопоток."""
+        if self.stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+    
+    def switch_device(self, device: Optional[int] = None):
+        """
+        Переключает устройство ввода без остановки распознавания.
         
-        # Запускаем обработку в отдельном потоке
-        self.process_thread = threading.Thread(target=self._process_loop, daemon=True)
-        self.process_thread.start()
+        Заменяется только аудиопоток PortAudio: поток обработки, модель
+        и накопленный текст остаются как есть.
+        
+        Args:
+            device: ID нового аудиоустройства (None = по умолчанию)
+        """
+        if not self.running:
+            print("⚠️ ASR не запущен")
+            return
+        
+        previous = self._device
+        # Старый поток закрывается первым: некоторые хост-API не дают открыть
+        # то же устройство дважды
+        self._close_stream()
+        
+        # Аудио со старого устройства не должно смешиваться с новым
+        with self.lock:
+            self._buffer_clear()
+            self.accumulated_audio.clear()
+        
+        try:
+            self._open_stream(device)
+        except Exception:
+            # Новое устройство недоступно — возвращаемся на прежнее и сообщаем об ошибке
+            try:
+                self._open_stream(previous)
+            except Exception:
+                pass
+            raise
     
     def stop(self):
         """Останавливает распознавание."""
         self.running = False
+        self._stop_event.set()
         
-        if self.stream:
-            self.stream.stop()
-            self.stream.close()
-            self.stream = None
+        self._close_stream()
         
         if self.process_thread:
             self.process_thread.join(timeout=1.0)
@@ -186,7 +334,7 @@ class RealtimeASR:
         
         # Очищаем буфер
         with self.lock:
-            self.buffer.clear()
+            self._buffer_clear()
         
         self.last_text = ""
     
@@ -206,7 +354,7 @@ class RealtimeASR:
         Очищает буфер и начинает накопление аудио.
         """
         with self.lock:
-            self.buffer.clear()
+            self._buffer_clear()
             self.accumulated_audio.clear()
         self.last_text = ""
         self.recording = True
@@ -231,21 +379,24 @@ class RealtimeASR:
                 try:
                     final_text = self.model.recognize(full_audio, sample_rate=self.sample_rate)
                 except Exception as e:
-                    print(f"\n⚠️ ASR Error: {e}", file=sys.stderr)
+                    self._emit(ASREvent.ERROR, e)
                 self.accumulated_audio.clear()
-            elif len(self.buffer) > 0:
+            elif self._buffer_len > 0:
                 # Используем текущий буфер
-                audio = np.array(list(self.buffer), dtype=np.float32)
+                audio = self._buffer_read()
                 try:
                     final_text = self.model.recognize(audio, sample_rate=self.sample_rate)
                 except Exception as e:
-                    print(f"\n⚠️ ASR Error: {e}", file=sys.stderr)
+                    self._emit(ASREvent.ERROR, e)
         
         # Добавляем в накопленный текст
         if final_text:
             self.accumulated_text.append(final_text)
-            if self.on_segment_complete:
-                self.on_segment_complete(final_text)
+            if self._accumulated_joined:
+                self._accumulated_joined += " " + final_text
+            else:
+                self._accumulated_joined = final_text
+            self._emit(ASREvent.SEGMENT, final_text)
         
         return final_text
     
@@ -257,7 +408,7 @@ class RealtimeASR:
     
     def get_accumulated_text(self) -> str:
         """Возвращает весь накопленный текст."""
-        return " ".join(self.accumulated_text)
+        return self._accumulated_joined
     
     def get_accumulated_segments(self) -> List[str]:
         """Возвращает список всех сегментов."""
@@ -266,17 +417,29 @@ class RealtimeASR:
     def clear_accumulated_text(self):
         """Очищает накопленный текст."""
         self.accumulated_text.clear()
+        self._accumulated_joined = ""
     
     def clear_buffer(self):
         """Очищает аудио буфер."""
         with self.lock:
-            self.buffer.clear()
+            self._buffer_clear()
             self.accumulated_audio.clear()
         self.last_text = ""
     
+    @property
+    def vad_threshold(self) -> float:
+        """Порог RMS для детектора голоса (0 = отключён)."""
+        return self._vad_threshold
+    
+    @vad_threshold.setter
+    def vad_threshold(self, value: float):
+        self._vad_threshold = value
+        # Порог для audio callback: RMS >= 0, поэтому -1 означает «речь всегда»
+        self._vad_gate = value if value > 0 else -1.0
+    
     def get_audio_level(self) -> float:
-        """Возвращает текущий уровень звука (0.0 - 1.0)."""
-        return min(self.audio_level, 1.0)
+        """Возвращает пиковый уровень звука за последние блоки (0.0 - 1.0)."""
+        return min(float(self._level_ring.max()), 1.0)
     
     def is_active(self) -> bool:
         """Возвращает True, если ASR запущен и не на паузе."""
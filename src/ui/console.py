@@ -10,43 +10,54 @@ Rich Console UI для GigaAM
 - Конвертация LaTeX в Unicode
 """
 
-from datetime import datetime
-from typing import Optional, List, Callable, Tuple
+from collections import deque
+from functools import lru_cache
+from typing import Optional, List, Callable, Tuple, Deque
+import importlib.util
 import threading
 import sys
 import io
 import time
 import re
 
+from ..audio_devices import is_loopback_name
+
 try:
     from rich.console import Console
     from rich.live import Live
     from rich.panel import Panel
     from rich.table import Table
     from rich.text import Text
-    from rich.progress import Progress, BarColumn, TextColumn
     from rich.layout import Layout
-    from rich.style import Style
-    from rich.prompt import Prompt, IntPrompt
+    from rich.prompt import IntPrompt
+    from rich.theme import Theme
     from rich import box
     RICH_AVAILABLE = True
 except ImportError:
     RICH_AVAILABLE = False
 
-# LaTeX to Unicode конвертация
-try:
-    from pylatexenc.latex2text import LatexNodes2Text
-    LATEX_AVAILABLE = True
-    _latex_converter = LatexNodes2Text()
-except ImportError:
-    LATEX_AVAILABLE = False
-    _latex_converter = None
+# LaTeX to Unicode конвертация (проверяем только наличие пакета; latex2text грузится лениво)
+LATEX_AVAILABLE = importlib.util.find_spec("pylatexenc") is not None
+_latex_converter = None
+
+
+def _get_latex_converter():
+    """Создаёт конвертер LaTeX при первом обращении (импорт и инициализация тяжёлые)."""
+    global _latex_converter
+    if _latex_converter is None:
+        from pylatexenc.latex2text import LatexNodes2Text
+        _latex_converter = LatexNodes2Text()
+    return _latex_converter
 
 
+@lru_cache(maxsize=1024)
 def latex_to_unicode(text: str) -> str:
     """
     Конвертирует LaTeX-разметку в Unicode символы.
     
+    Результат кэшируется: вывод Codex полон повторяющихся строк
+    (пустые строки, разделители, повторы формул).
+    
     Примеры:
         \\frac{1}{2} → 1/2
         \\neq → ≠
@@ -56,13 +67,13 @@ def latex_to_unicode(text: str) -> str:
     if not text:
         return text
     
-    if LATEX_AVAILABLE and _latex_converter:
+    if LATEX_AVAILABLE:
         try:
             # Убираем inline math delimiters \(...\) и $...$
             text = re.sub(r'\\\((.*?)\\\)', r'\1', text)
             text = re.sub(r'\$([^\$]+)\$', r'\1', text)
             # Конвертируем LaTeX команды в Unicode
-            text = _latex_converter.latex_to_text(text)
+            text = _get_latex_converter().latex_to_text(text)
         except Exception:
             pass
     else:
@@ -114,6 +125,35 @@ def latex_to_unicode(text: str) -> str:
     return text
 
 
+# Кэш строки времени: сегменты в пределах одной секунды получают одну и ту же строку
+_LAST_TS = [0, ""]
+
+
+def _now_hms() -> str:
+    """Возвращает текущее время в формате ЧЧ:ММ:СС (форматируется раз в секунду)."""
+    t = int(time.time())
+    if t != _LAST_TS[0]:
+        _LAST_TS[1] = time.strftime("%H:%M:%S", time.localtime(t))
+        _LAST_TS[0] = t
+    return _LAST_TS[1]
+
+
+# UTF-8 обёртки над бинарными буферами: id(буфера) -> TextIOWrapper.
+# Записи не вытесняются: собранная обёртка закрыла бы нижележащий буфер
+_UTF8_STREAMS = {}
+
+
+def _utf8_stream(stream):
+    """Возвращает общую UTF-8 обёртку над буфером потока (одну на буфер на весь процесс)."""
+    buffer = getattr(stream, "buffer", None)
+    if buffer is None:
+        return stream
+    wrapper = _UTF8_STREAMS.get(id(buffer))
+    if wrapper is None:
+        wrapper = _UTF8_STREAMS[id(buffer)] = io.TextIOWrapper(
+            buffer, encoding="utf-8", errors="replace", write_through=True
+        )
+    return wrapper
 
 
 # Цветовая схема
@@ -133,13 +173,135 @@ class Colors:
     LEVEL_HIGH = "#FF0000"   # Красный (громко)
 
 
+# Подписи уровня звука 0.00–1.00 (без форматирования float на каждом кадре)
+_LEVEL_LABELS = tuple(f" {i / 100:.2f}" for i in range(101))
+
+_SPEAK_PLACEHOLDER = "Говорите..."
+# Индикатор статуса простого UI по флагу записи
+_SIMPLE_STATUS = {True: "🔴 REC", False: "⚪ READY"}
+# Полоса уровня простого UI: готовая строка, из которой вырезается окно нужной заливки
+_SIMPLE_BAR_CELLS = 10
+_SIMPLE_BAR = "▓" * _SIMPLE_BAR_CELLS + "░" * _SIMPLE_BAR_CELLS
+
+
+def simple_level_bar(bars: int) -> str:
+    """Текстовая полоса уровня на 10 ячеек с bars закрашенными (общая для простых режимов)."""
+    bars = max(0, min(_SIMPLE_BAR_CELLS, bars))
+    return _SIMPLE_BAR[_SIMPLE_BAR_CELLS - bars:2 * _SIMPLE_BAR_CELLS - bars]
+
+
+if RICH_AVAILABLE:
+    # Единая тема приложения: стили разбираются один раз при создании консоли,
+    # а в коде отрисовки используются только имена
+    GIGAAM_THEME = Theme({
+        "level.low": Colors.LEVEL_LOW,
+        "level.mid": Colors.LEVEL_MID,
+        "level.high": Colors.LEVEL_HIGH,
+        "level.empty": "dim",
+        "status.recording": "bold red",
+        "status.paused": "bold yellow",
+        "status.ready": "bold green",
+        "asr.current": "bold white",
+        "asr.muted": "dim",
+        "scroll.arrow": "dim cyan",
+        "scroll.position": "dim",
+        "panel.asr": "cyan",
+        "panel.codex": "magenta",
+        "panel.fast": "yellow",
+        "title.asr": "bold cyan",
+        "title.codex": "bold magenta",
+        "title.fast": "bold yellow",
+        "device.loopback": "yellow",
+        "device.input": "green",
+        "msg.success": "green",
+        "msg.error": "red",
+        "msg.warning": "yellow",
+        "msg.info": "cyan",
+        "segment.time": "dim",
+        "segment.copied": "green",
+        "segment.text": "white",
+    })
+    
+    # Уже разобранные объекты Style для горячего пути отрисовки:
+    # спаны с готовым Style не требуют поиска по теме на каждом кадре
+    _STYLES = GIGAAM_THEME.styles
+    
+    # Готовые индикаторы статуса записи (собираются один раз, а не на каждом кадре)
+    _STATUS_RECORDING = Text("🔴 ЗАПИСЬ", style=_STYLES["status.recording"])
+    _STATUS_PAUSED = Text("⏸️  ПАУЗА", style=_STYLES["status.paused"])
+    _STATUS_READY = Text("⚪ ГОТОВ", style=_STYLES["status.ready"])
+    # (is_recording, is_paused) -> индикатор; запись важнее паузы
+    _STATUS_TEXTS = {
+        (True, False): _STATUS_RECORDING,
+        (True, True): _STATUS_RECORDING,
+        (False, True): _STATUS_PAUSED,
+        (False, False): _STATUS_READY,
+    }
+    
+    # Статические подписи панелей: готовые Text без разбора разметки на каждом кадре
+    _HINT_PUSH_TO_TALK = Text("Удерживайте [SPACE] для записи • [ESC] выход", style=_STYLES["asr.muted"])
+    _HINT_CONTINUOUS = Text("Ctrl+C для выхода", style=_STYLES["asr.muted"])
+    _SCROLL_HINT = Text("↑/↓ прокрутка", style=_STYLES["asr.muted"])
+    _CODEX_PLACEHOLDER = Text("Ожидание запроса...", style=_STYLES["asr.muted"])
+    _CODEX_FAST_PLACEHOLDER = Text("Ожидание...", style=_STYLES["asr.muted"])
+    
+    # Ячейка «Тип» в таблице устройств по признаку loopback
+    _DEVICE_TYPE_TEXTS = {
+        True: Text("🔄 Loopback", style=_STYLES["device.loopback"]),
+        False: Text("🎤 Вход", style=_STYLES["device.input"]),
+    }
+    
+    # Сборщики готовых Text: строятся один раз на процесс и общие для всех экземпляров UI
+    @lru_cache(maxsize=None)
+    def _build_level_bar(filled: int, width: int) -> Text:
+        """Рисует полосу уровня с заданным числом закрашенных ячеек."""
+        empty = width - filled
+        
+        bar = Text()
+        
+        # Градиентная полоса: по одному сегменту на зону вместо символа на ячейку
+        low_end = (width + 1) // 2          # ratio < 0.5
+        mid_end = (4 * width + 4) // 5      # ratio < 0.8
+        low = min(filled, low_end)
+        mid = min(filled, mid_end) - low
+        high = filled - low - mid
+        if low:
+            bar.append("█" * low, style=_STYLES["level.low"])
+        if mid > 0:
+            bar.append("█" * mid, style=_STYLES["level.mid"])
+        if high > 0:
+            bar.append("█" * high, style=_STYLES["level.high"])
+        
+        bar.append("░" * empty, style=_STYLES["level.empty"])
+        
+        return bar
+    
+    @lru_cache(maxsize=256)
+    def _build_title(label: str, style: str) -> Text:
+        """Заголовок панели как готовый Text со стилем темы."""
+        return Text(label, style=_STYLES[style])
+
+# Максимум хранимых сегментов: длинная сессия не должна расти в памяти бесконечно
+_MAX_SEGMENTS = 2000
+# Предел истории панели Codex в строках: старые строки отбрасываются
+_MAX_CODEX_LINES = 1000
+
+# Области live-кадра: ASR слева, быстрый и полный Codex справа
+_REGIONS = ("left", "fast", "full")
+
+
 class DeviceSelector:
     """Интерактивный выбор аудиоустройства."""
     
-    def __init__(self):
+    def __init__(self, console: Optional["Console"] = None):
+        """
+        Args:
+            console: Общая консоль приложения (например, ui.console);
+                     если не задана, создаётся своя с темой приложения
+        """
         if not RICH_AVAILABLE:
             raise ImportError("Rich library is required. Install: pip install rich")
-        self.console = Console()
+        self.console = console or Console(theme=GIGAAM_THEME, emoji=False, file=_utf8_stream(sys.stdout))
     
     def select_device(self, devices_tuple, title: str = "Выберите устройство") -> Optional[int]:
         """
@@ -178,27 +340,16 @@ class DeviceSelector:
         table.add_column("Каналы", justify="center", width=8)
         table.add_column("Тип", justify="center", width=12)
         
-        # Определяем loopback ключевые слова
-        loopback_keywords = ['loopback', 'stereo mix', 'what u hear', 'wave out', 'wasapi']
-        
         device_ids = []
         
         # Добавляем входные устройства
         for idx, name, channels in input_devices:
-            # Проверяем, является ли устройство loopback
-            name_lower = name.lower()
-            is_loopback = any(kw in name_lower for kw in loopback_keywords)
-            
-            if is_loopback:
-                dev_type = "[yellow]🔄 Loopback[/yellow]"
-            else:
-                dev_type = "[green]🎤 Вход[/green]"
-            
+            # Имя — обычный текст, тип — готовая ячейка по признаку loopback
             table.add_row(
                 str(idx),
-                name,
+                Text(name),
                 str(channels),
-                dev_type
+                _DEVICE_TYPE_TEXTS[is_loopback_name(name)]
             )
             device_ids.append(idx)
         
@@ -230,12 +381,11 @@ class RichConsoleUI:
             raise ImportError("Rich library is required. Install: pip install rich")
         
         # Консоль с отключением очистки для уменьшения мерцания
-        stdout = sys.stdout
-        if hasattr(stdout, "buffer"):
-            stdout = io.TextIOWrapper(stdout.buffer, encoding="utf-8", errors="replace", write_through=True)
-        self._console_file = stdout  # сохраняем, чтобы его не сборщило
+        self._console_file = _utf8_stream(sys.stdout)
         self.console = Console(
             highlight=False,
+            theme=GIGAAM_THEME,
+            emoji=False,  # эмодзи в строках уже юникодные, :коды: не используются
             force_terminal=True,
             legacy_windows=False,  # форсируем UTF-8 и modern console API
             file=self._console_file,
@@ -249,9 +399,14 @@ class RichConsoleUI:
         self.audio_level = 0.0
         self._smoothed_level = 0.0  # Сглаженный уровень для анимации
         self._level_smoothing = 0.3  # Коэффициент сглаживания (0-1, меньше = плавнее)
+        self._level_width = 20  # Ширина полосы уровня в символах
+        self._level_cells = 0  # Число закрашенных ячеек на последнем кадре
+        self._asr_body_key = None  # (накопленный, текущий, запись) последнего тела панели
+        self._asr_body: Optional[Text] = None
         self.current_text = ""
         self.accumulated_text = ""
-        self.segments: List[Tuple[str, str]] = []  # (timestamp, text)
+        self.segments: Deque[Tuple[str, str]] = deque(maxlen=_MAX_SEGMENTS)  # (timestamp, text)
+        self.segments_dropped = 0  # Сколько ранних сегментов вытеснено пределом _MAX_SEGMENTS
         self.device_name = "Не выбрано"
         self.mode = "continuous"  # continuous | push_to_talk
         
@@ -259,8 +414,14 @@ class RichConsoleUI:
         self._live: Optional[Live] = None
         self._stop_event = threading.Event()
         self._update_thread: Optional[threading.Thread] = None
-        self._last_render = 0.0
-        self._min_render_interval = 0.08  # ~12 FPS, чтобы сгладить обновления
+        self._refresh_interval = 0.1  # Тик перерисовки (~10 FPS)
+        # Коалесцирование: изменения лишь помечают кадр, Live перестраивает его раз в тик
+        self._dirty_regions = set(_REGIONS)  # Области кадра, требующие перестроения
+        self._render_lock = threading.Lock()
+        self._display_cache: Optional[Layout] = None
+        self._layout: Optional[Layout] = None
+        self._layout_regions: dict = {}
+        self._layout_with_fast = False
         
         # Codex panel fields
         self.codex_text = ""
@@ -270,6 +431,9 @@ class RichConsoleUI:
         # Codex scrolling - динамическое определение размера
         self.codex_scroll_offset = 0
         self._codex_lines_cache = []
+        # Обновления от потока Codex копятся здесь и применяются раз за кадр
+        self._codex_pending: List[str] = []
+        self._codex_reset: Optional[str] = None
         
         # Fast Codex panel fields (low reasoning)
         self.codex_fast_text = ""
@@ -277,9 +441,14 @@ class RichConsoleUI:
         self.codex_fast_enabled = True
         self.codex_fast_scroll_offset = 0
         self._codex_fast_lines_cache = []
+        self._codex_fast_pending: List[str] = []
+        self._codex_fast_reset: Optional[str] = None
         
         # Динамический размер окна
         self._panel_size_offset = 0  # Смещение размера (можно менять +/-)
+        # Высота терминала: опрашивается раз за кадр, а не при каждом обращении
+        self._terminal_height: Optional[int] = None
+        self._terminal_size = None  # (ширина, высота) терминала на последнем тике
     
     def print_banner(self):
         """Выводит приветственный баннер."""
@@ -325,77 +494,126 @@ class RichConsoleUI:
         self.console.print(panel)
     
     def _get_level_bar(self, level: float, width: int = 20) -> Text:
-        """Создаёт цветную полосу уровня звука."""
-        filled = int(level * width)
-        empty = width - filled
-        
-        bar = Text()
-        
-        # Градиентная полоса
-        for i in range(filled):
-            ratio = i / width
-            if ratio < 0.5:
-                bar.append("█", style=Colors.LEVEL_LOW)
-            elif ratio < 0.8:
-                bar.append("█", style=Colors.LEVEL_MID)
-            else:
-                bar.append("█", style=Colors.LEVEL_HIGH)
-        
-        bar.append("░" * empty, style="dim")
-        
-        return bar
+        """Возвращает цветную полосу уровня звука (готовые полосы общие для процесса)."""
+        filled = max(0, min(width, int(level * width)))
+        return _build_level_bar(filled, width)
+    
+    def _get_title(self, label: str, style: str) -> Text:
+        """Заголовок панели: собирается один раз на значение, без разбора разметки."""
+        return _build_title(label, style)
     
     def update_codex(self, text: str, status: str = None, append: bool = False):
-        """Обновляет панель Codex (full)."""
-        if status:
-            self.codex_status = status
+        """Обновляет панель Codex (full); текст применяется пакетом при отрисовке кадра."""
+        # Конвертируем LaTeX в Unicode
+        text = latex_to_unicode(text)
         
+        with self._render_lock:
+            if status:
+                self.codex_status = status
+            if append:
+                self._codex_pending.append(text)
+            else:
+                self._codex_reset = text
+                self._codex_pending = []
+            self._dirty_regions.add("full")
+    
+    def update_codex_fast(self, text: str, status: str = None, append: bool = False):
+        """Обновляет панель быстрого Codex (low reasoning); текст применяется при отрисовке."""
         # Конвертируем LaTeX в Unicode
         text = latex_to_unicode(text)
         
-        if append:
-            self.codex_text += text
-        else:
-            self.codex_text = text
+        with self._render_lock:
+            if status:
+                self.codex_fast_status = status
+            if append:
+                self._codex_fast_pending.append(text)
+            else:
+                self._codex_fast_reset = text
+                self._codex_fast_pending = []
+            self._dirty_regions.add("fast")
+    
+    def _flush_codex(self):
+        """Применяет накопленные с прошлого кадра строки Codex одним проходом."""
+        with self._render_lock:
+            reset, pending = self._codex_reset, self._codex_pending
+            if reset is None and not pending:
+                return
+            self._codex_reset = None
+            self._codex_pending = []
+        
+        if reset is not None:
+            self.codex_text = reset
             self.codex_scroll_offset = 0
+            self._codex_lines_cache = []
+        
+        # Следуем за концом текста, только если пользователь не прокрутил панель вверх
+        visible_lines = self.codex_visible_lines
+        at_bottom = self.codex_scroll_offset >= len(self._codex_lines_cache) - visible_lines
+        
+        if pending:
+            self.codex_text += "".join(pending)
         
         # Обновляем кэш строк
         self._codex_lines_cache = self.codex_text.split('\n') if self.codex_text else []
         
+        # Ограничиваем историю: панель — просмотрщик, а не бесконечный журнал
+        dropped = len(self._codex_lines_cache) - _MAX_CODEX_LINES
+        if dropped > 0:
+            del self._codex_lines_cache[:dropped]
+            self.codex_text = '\n'.join(self._codex_lines_cache)
+            self.codex_scroll_offset = max(0, self.codex_scroll_offset - dropped)
+        
         # Автопрокрутка вниз при добавлении текста
-        if append and len(self._codex_lines_cache) > self.codex_visible_lines:
-            self.codex_scroll_offset = max(0, len(self._codex_lines_cache) - self.codex_visible_lines)
-            
-        # Форсируем обновление, если Live запущен
-        self._request_render()
+        if pending and at_bottom and len(self._codex_lines_cache) > visible_lines:
+            self.codex_scroll_offset = max(0, len(self._codex_lines_cache) - visible_lines)
     
-    def update_codex_fast(self, text: str, status: str = None, append: bool = False):
-        """Обновляет панель быстрого Codex (low reasoning)."""
-        if status:
-            self.codex_fast_status = status
-        
-        # Конвертируем LaTeX в Unicode
-        text = latex_to_unicode(text)
-        
-        if append:
-            self.codex_fast_text += text
-        else:
-            self.codex_fast_text = text
+    def _flush_codex_fast(self):
+        """Применяет накопленные строки быстрого Codex одним проходом."""
+        with self._render_lock:
+            reset, pending = self._codex_fast_reset, self._codex_fast_pending
+            if reset is None and not pending:
+                return
+            self._codex_fast_reset = None
+            self._codex_fast_pending = []
+        
+        if reset is not None:
+            self.codex_fast_text = reset
             self.codex_fast_scroll_offset = 0
+        if pending:
+            self.codex_fast_text += "".join(pending)
         
         # Обновляем кэш строк
         self._codex_fast_lines_cache = self.codex_fast_text.split('\n') if self.codex_fast_text else []
         
+        # Ограничиваем историю так же, как у полной панели
+        dropped = len(self._codex_fast_lines_cache) - _MAX_CODEX_LINES
+        if dropped > 0:
+            del self._codex_fast_lines_cache[:dropped]
+            self.codex_fast_text = '\n'.join(self._codex_fast_lines_cache)
+            self.codex_fast_scroll_offset = max(0, self.codex_fast_scroll_offset - dropped)
+        
         # Автопрокрутка вниз при добавлении текста
-        if append and len(self._codex_fast_lines_cache) > self.codex_fast_visible_lines:
-            self.codex_fast_scroll_offset = max(0, len(self._codex_fast_lines_cache) - self.codex_fast_visible_lines)
-            
-        self._request_render()
+        if pending:
+            overflow = len(self._codex_fast_lines_cache) - self.codex_fast_visible_lines
+            if overflow > 0:
+                self.codex_fast_scroll_offset = overflow
+    
+    def _refresh_terminal_height(self) -> int:
+        """Перечитывает высоту терминала (вызывается раз за перестроение кадра)."""
+        self._terminal_height = self.console.height or 30
+        return self._terminal_height
+    
+    @property
+    def terminal_height(self) -> int:
+        """Кэшированная высота терминала."""
+        if self._terminal_height is None:
+            return self._refresh_terminal_height()
+        return self._terminal_height
     
     @property
     def codex_visible_lines(self) -> int:
         """Динамическое количество видимых строк для Full Codex на основе высоты терминала."""
-        terminal_height = self.console.height or 30
+        terminal_height = self.terminal_height
         # Базовое количество строк: ~40% высоты терминала для Full Codex
         base_lines = max(5, int(terminal_height * 0.4))
         return max(3, base_lines + self._panel_size_offset)
@@ -403,75 +621,98 @@ class RichConsoleUI:
     @property
     def codex_fast_visible_lines(self) -> int:
         """Динамическое количество видимых строк для Fast Codex."""
-        terminal_height = self.console.height or 30
+        terminal_height = self.terminal_height
         # Базовое количество строк: ~25% высоты терминала для Fast Codex
         base_lines = max(4, int(terminal_height * 0.25))
         return max(2, base_lines + self._panel_size_offset)
     
     def increase_panel_size(self, amount: int = 2):
-        """Увеличить размер панелей Codex."""
+        """Увеличить размер панелей Codex (пересобираются только панели Codex)."""
         self._panel_size_offset += amount
-        self._request_render()
+        self._request_render("full", "fast")
     
     def decrease_panel_size(self, amount: int = 2):
-        """Уменьшить размер панелей Codex."""
+        """Уменьшить размер панелей Codex (пересобираются только панели Codex)."""
         self._panel_size_offset = max(-10, self._panel_size_offset - amount)
-        self._request_render()
+        self._request_render("full", "fast")
     
     def reset_panel_size(self):
-        """Сбросить размер панелей к значению по умолчанию."""
+        """Сбросить размер панелей Codex к значению по умолчанию."""
         self._panel_size_offset = 0
-        self._request_render()
+        self._request_render("full", "fast")
     
     def scroll_codex_up(self, lines: int = 3):
         """Прокрутка ответа Codex вверх."""
         if self.codex_scroll_offset > 0:
             self.codex_scroll_offset = max(0, self.codex_scroll_offset - lines)
-            self._request_render()
+            self._request_render("full")
     
     def scroll_codex_down(self, lines: int = 3):
         """Прокрутка ответа Codex вниз."""
         max_offset = max(0, len(self._codex_lines_cache) - self.codex_visible_lines)
         if self.codex_scroll_offset < max_offset:
             self.codex_scroll_offset = min(max_offset, self.codex_scroll_offset + lines)
-            self._request_render()
+            self._request_render("full")
     
     def scroll_codex_to_top(self):
         """Прокрутка в начало."""
         if self.codex_scroll_offset != 0:
             self.codex_scroll_offset = 0
-            self._request_render()
+            self._request_render("full")
     
     def scroll_codex_to_bottom(self):
         """Прокрутка в конец."""
         max_offset = max(0, len(self._codex_lines_cache) - self.codex_visible_lines)
         if self.codex_scroll_offset != max_offset:
             self.codex_scroll_offset = max_offset
-            self._request_render()
+            self._request_render("full")
 
-    def _request_render(self):
-        if not self._live:
-            return
-        now = time.monotonic()
-        if now - self._last_render < self._min_render_interval:
-            return
-        self._last_render = now
-        self._live.update(self._generate_display())
+    def _request_render(self, *regions: str):
+        """
+        Помечает области кадра устаревшими; перестроение выполнит Live на ближайшем тике.
+        
+        Args:
+            regions: Имена областей ("left", "fast", "full"); без аргументов — все
+        """
+        with self._render_lock:
+            self._dirty_regions.update(regions or _REGIONS)
+    
+    def _get_renderable(self) -> Layout:
+        """Возвращает кэшированный кадр, перестраивая только изменившиеся панели."""
+        if self._dirty_regions or self._display_cache is None:
+            self._display_cache = self._generate_display()
+        return self._display_cache
     
     def _generate_display(self) -> Layout:
-        """Генерирует Layout с двумя панелями (ASR слева, Codex справа)."""
+        """Генерирует Layout с панелями ASR и Codex, обновляя только устаревшие области."""
+        layout, regions, rebuilt = self._get_layout()
+        
+        with self._render_lock:
+            dirty = _REGIONS if rebuilt else self._dirty_regions
+            self._dirty_regions = set()
+        
+        if "left" in dirty:
+            regions["left"].update(self._build_asr_panel())
+        if "full" in dirty:
+            regions["full"].update(self._build_codex_panel())
+        if "fast" in dirty and "fast" in regions:
+            regions["fast"].update(self._build_codex_fast_panel())
+        
+        return layout
+    
+    def _build_asr_panel(self) -> Panel:
+        """Левая панель: статус, уровень звука и распознанный текст."""
         # --- 1. ЛЕВАЯ ПАНЕЛЬ (ASR) ---
         # Статус записи
-        if self.is_recording:
-            status_text = Text("🔴 ЗАПИСЬ", style="bold red")
-        elif self.is_paused:
-            status_text = Text("⏸️  ПАУЗА", style="bold yellow")
-        else:
-            status_text = Text("⚪ ГОТОВ", style="bold green")
+        status_text = _STATUS_TEXTS[bool(self.is_recording), bool(self.is_paused)]
         
         # Уровень звука
-        level_bar = self._get_level_bar(self.audio_level)
-        level_info = Text(f" {self.audio_level:.2f}", style="dim")
+        # Числовая подпись квантуется так же, как полоса (0.05 при 20 ячейках):
+        # кадр перестраивается только при смене числа ячеек
+        width = self._level_width
+        cells = max(0, min(width, int(self.audio_level * width)))
+        level_bar = self._get_level_bar(self.audio_level, width)
+        level_info = Text(_LEVEL_LABELS[cells * 100 // width], style=_STYLES["asr.muted"])
         
         # Сборка контента ASR
         asr_content = Text()
@@ -481,143 +722,188 @@ class RichConsoleUI:
         asr_content.append_text(level_bar)
         asr_content.append_text(level_info)
         asr_content.append("\n\n")
-        
-        # Накопленный текст
-        if self.accumulated_text:
-            asr_content.append(self.accumulated_text, style="dim")
-            asr_content.append("\n")
-        
-        # Текущий текст
-        current_disp = self.current_text if self.current_text else "[dim]Говорите...[/dim]"
-        if self.is_recording:
-            asr_content.append(current_disp, style="bold white")
-        else:
-            asr_content.append(current_disp)
+        asr_content.append_text(self._get_asr_body())
         
         # Подсказки
-        if self.mode == "push_to_talk":
-            hint = "[dim]Удерживайте [SPACE] для записи • [ESC] выход[/dim]"
-        else:
-            hint = "[dim]Ctrl+C для выхода[/dim]"
+        hint = _HINT_PUSH_TO_TALK if self.mode == "push_to_talk" else _HINT_CONTINUOUS
 
-        left_panel = Panel(
+        return Panel(
             asr_content,
-            title=f"[bold cyan]🎤 {self.device_name}[/bold cyan]",
+            title=self._get_title(f"🎤 {self.device_name}", "title.asr"),
             subtitle=hint,
-            border_style="cyan",
+            border_style=_STYLES["panel.asr"],
             box=box.ROUNDED,
             padding=(0, 1)
         )
-
+    
+    def _get_asr_body(self) -> Text:
+        """Текст распознавания; пересобирается только при смене текста или режима."""
+        key = (self.accumulated_text, self.current_text, self.is_recording)
+        if key == self._asr_body_key:
+            return self._asr_body
+        
+        body = Text()
+        
+        # Накопленный текст
+        if self.accumulated_text:
+            body.append(self.accumulated_text, style=_STYLES["asr.muted"])
+            body.append("\n")
+        
+        # Текущий текст
+        if not self.current_text:
+            body.append(_SPEAK_PLACEHOLDER, style=_STYLES["asr.muted"])
+        elif self.is_recording:
+            body.append(self.current_text, style=_STYLES["asr.current"])
+        else:
+            body.append(self.current_text)
+        
+        self._asr_body_key = key
+        self._asr_body = body
+        return body
+    
+    def _build_codex_panel(self) -> Panel:
+        """Правая панель: ответ Codex со скроллингом."""
+        self._flush_codex()
         # --- 2. ПРАВАЯ ПАНЕЛЬ (CODEX full) со скроллингом ---
+        # Свойства и атрибуты читаются один раз за кадр
+        lines = self._codex_lines_cache
+        total_lines = len(lines)
+        page = self.codex_visible_lines
+        offset = self.codex_scroll_offset
+        
         if self.codex_text:
-            lines = self._codex_lines_cache
-            total_lines = len(lines)
-            
             # Получаем видимые строки с учётом смещения
-            visible_lines = lines[self.codex_scroll_offset:self.codex_scroll_offset + self.codex_visible_lines]
+            visible_lines = lines[offset:offset + page]
             codex_display = '\n'.join(visible_lines)
             
             # Индикатор прокрутки
-            if total_lines > self.codex_visible_lines:
-                can_scroll_up = self.codex_scroll_offset > 0
-                can_scroll_down = self.codex_scroll_offset < total_lines - self.codex_visible_lines
+            if total_lines > page:
+                can_scroll_up = offset > 0
+                can_scroll_down = offset < total_lines - page
                 
                 scroll_indicator = Text()
                 if can_scroll_up:
-                    scroll_indicator.append("▲ ", style="dim cyan")
+                    scroll_indicator.append("▲ ", style=_STYLES["scroll.arrow"])
                 else:
                     scroll_indicator.append("  ")
-                scroll_indicator.append(f"[{self.codex_scroll_offset + 1}-{min(self.codex_scroll_offset + self.codex_visible_lines, total_lines)}/{total_lines}]", style="dim")
+                scroll_indicator.append(f"[{offset + 1}-{min(offset + page, total_lines)}/{total_lines}]", style=_STYLES["scroll.position"])
                 if can_scroll_down:
-                    scroll_indicator.append(" ▼", style="dim cyan")
+                    scroll_indicator.append(" ▼", style=_STYLES["scroll.arrow"])
                 
                 codex_content = Text()
                 codex_content.append(codex_display)
                 codex_content.append("\n\n")
                 codex_content.append_text(scroll_indicator)
             else:
-                codex_content = codex_display
+                # Вывод Codex — обычный текст: без разбора Rich-разметки ([..] в коде и т.п.)
+                codex_content = Text(codex_display)
         else:
-            codex_content = "[dim]Ожидание запроса...[/dim]"
+            codex_content = _CODEX_PLACEHOLDER
         
-        scroll_hint = "[dim]↑/↓ прокрутка[/dim]" if len(self._codex_lines_cache) > self.codex_visible_lines else ""
+        scroll_hint = _SCROLL_HINT if total_lines > page else None
         
-        codex_full_panel = Panel(
+        return Panel(
             codex_content,
-            title=f"[bold magenta]🤖 Codex: {self.codex_status}[/bold magenta]",
+            title=self._get_title(f"🤖 Codex: {self.codex_status}", "title.codex"),
             subtitle=scroll_hint,
-            border_style="magenta",
+            border_style=_STYLES["panel.codex"],
             box=box.ROUNDED,
             padding=(0, 1)
         )
-        
+    
+    def _build_codex_fast_panel(self) -> Panel:
+        """Панель быстрого Codex (low reasoning)."""
+        self._flush_codex_fast()
         # --- 3. ПАНЕЛЬ БЫСТРОГО CODEX (low reasoning) ---
-        if self.codex_fast_enabled:
-            if self.codex_fast_text:
-                fast_lines = self._codex_fast_lines_cache
-                fast_total = len(fast_lines)
-                fast_visible = fast_lines[self.codex_fast_scroll_offset:self.codex_fast_scroll_offset + self.codex_fast_visible_lines]
-                fast_display = '\n'.join(fast_visible)
-                
-                if fast_total > self.codex_fast_visible_lines:
-                    fast_indicator = Text()
-                    fast_indicator.append(fast_display)
-                    fast_indicator.append(f"\n[dim][{self.codex_fast_scroll_offset + 1}-{min(self.codex_fast_scroll_offset + self.codex_fast_visible_lines, fast_total)}/{fast_total}][/dim]")
-                    fast_content = fast_indicator
-                else:
-                    fast_content = fast_display
-            else:
-                fast_content = "[dim]Ожидание...[/dim]"
+        if self.codex_fast_text:
+            fast_lines = self._codex_fast_lines_cache
+            fast_total = len(fast_lines)
+            page = self.codex_fast_visible_lines
+            offset = self.codex_fast_scroll_offset
+            fast_visible = fast_lines[offset:offset + page]
+            fast_display = '\n'.join(fast_visible)
             
-            codex_fast_panel = Panel(
-                fast_content,
-                title=f"[bold yellow]⚡ Fast: {self.codex_fast_status}[/bold yellow]",
-                border_style="yellow",
-                box=box.ROUNDED,
-                padding=(0, 1)
-            )
-
-        # --- 4. СБОРКА LAYOUT ---
-        layout = Layout()
-        
-        if self.codex_fast_enabled:
-            # Трёхпанельный layout: ASR слева, Fast сверху-справа, Full снизу-справа
-            right_layout = Layout()
-            right_layout.split_column(
-                Layout(codex_fast_panel, name="fast", ratio=2),
-                Layout(codex_full_panel, name="full", ratio=3)
-            )
-            layout.split_row(
-                Layout(left_panel, name="left", ratio=1),
-                Layout(right_layout, name="right", ratio=1)
-            )
+            if fast_total > page:
+                fast_indicator = Text()
+                fast_indicator.append(fast_display)
+                fast_indicator.append(f"\n[{offset + 1}-{min(offset + page, fast_total)}/{fast_total}]", style=_STYLES["scroll.position"])
+                fast_content = fast_indicator
+            else:
+                fast_content = Text(fast_display)
         else:
-            # Двухпанельный layout: ASR слева, Full Codex справа
-            layout.split_row(
-                Layout(left_panel, name="left", ratio=1),
-                Layout(codex_full_panel, name="right", ratio=1)
-            )
+            fast_content = _CODEX_FAST_PLACEHOLDER
         
-        return layout
+        return Panel(
+            fast_content,
+            title=self._get_title(f"⚡ Fast: {self.codex_fast_status}", "title.fast"),
+            border_style=_STYLES["panel.fast"],
+            box=box.ROUNDED,
+            padding=(0, 1)
+        )
+    
+    def _get_layout(self) -> Tuple[Layout, dict, bool]:
+        """Возвращает постоянное дерево Layout, его области и флаг пересоздания."""
+        rebuilt = self._layout is None or self._layout_with_fast != self.codex_fast_enabled
+        if rebuilt:
+            layout = Layout()
+            left = Layout(name="left", ratio=1)
+            full = Layout(name="full", ratio=3 if self.codex_fast_enabled else 1)
+            regions = {"left": left, "full": full}
+            
+            if self.codex_fast_enabled:
+                # Трёхпанельный layout: ASR слева, Fast сверху-справа, Full снизу-справа
+                fast = Layout(name="fast", ratio=2)
+                right = Layout(name="right", ratio=1)
+                right.split_column(fast, full)
+                layout.split_row(left, right)
+                regions["fast"] = fast
+            else:
+                # Двухпанельный layout: ASR слева, Full Codex справа
+                layout.split_row(left, full)
+            
+            self._layout = layout
+            self._layout_regions = regions
+            self._layout_with_fast = self.codex_fast_enabled
+        return self._layout, self._layout_regions, rebuilt
     
     def start_live_display(self):
         """Запускает Live Display."""
         self._stop_event.clear()
-        self._last_render = 0.0
+        self._request_render()
+        # Автообновление Live выключено: кадр выводит _refresh_loop и только при изменениях
         self._live = Live(
-            self._generate_display(),
             console=self.console,
-            refresh_per_second=10,
-            auto_refresh=True,
+            get_renderable=self._get_renderable,
+            auto_refresh=False,
             transient=True,  # Не оставляет след после остановки
             vertical_overflow="visible",  # Предотвращает обрезку
         )
-        self._live.start()
+        self._live.start(refresh=True)
+        self._update_thread = threading.Thread(target=self._refresh_loop, daemon=True)
+        self._update_thread.start()
+    
+    def _refresh_loop(self):
+        """Перерисовывает Live не чаще раза в тик и только если кадр устарел."""
+        while not self._stop_event.wait(self._refresh_interval):
+            live = self._live
+            if live is None:
+                break
+            size = self.console.size
+            if size != self._terminal_size:
+                # Размер терминала (ширина или высота) изменился — перерисовываем весь кадр:
+                # без автообновления Live сам не узнает о смене ширины
+                self._terminal_size = size
+                self._refresh_terminal_height()
+                self._request_render()
+            if self._dirty_regions:
+                live.refresh()
     
     def stop_live_display(self):
         """Останавливает Live Display."""
         self._stop_event.set()
+        if self._update_thread:
+            self._update_thread.join(timeout=1.0)
+            self._update_thread = None
         if self._live:
             self._live.stop()
             self._live = None
@@ -644,9 +930,12 @@ class RichConsoleUI:
                 self._level_smoothing * new_level + 
                 (1 - self._level_smoothing) * self._smoothed_level
             )
-            # Обновляем только если изменение значительное (>2%)
-            if abs(self._smoothed_level - self.audio_level) > 0.02:
-                self.audio_level = self._smoothed_level
+            self.audio_level = self._smoothed_level
+            # Перерисовка нужна, только если на полосе сменилось число ячеек
+            # (подпись уровня квантуется по тем же ячейкам)
+            cells = int(self.audio_level * self._level_width)
+            if cells != self._level_cells:
+                self._level_cells = cells
                 changed = True
         
         if recording is not None and recording != self.is_recording:
@@ -663,25 +952,28 @@ class RichConsoleUI:
         
         # Обновляем Live только при реальных изменениях
         if self._live and changed:
-            self._request_render()
+            self._request_render("left")
     
     def add_segment(self, text: str):
-        """Добавляет распознанный сегмент."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        """Добавляет распознанный сегмент (при переполнении вытесняется самый ранний)."""
+        if len(self.segments) == self.segments.maxlen:
+            self.segments_dropped += 1
+        timestamp = _now_hms()
         self.segments.append((timestamp, text))
     
     def print_segment(self, text: str, copied: bool = False):
         """Выводит сегмент текста (без Live)."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = _now_hms()
         
+        # Спаны с готовыми Style из темы: ни разметки, ни разбора строк стилей
         output = Text()
         if self.show_timestamps:
-            output.append(f"[{timestamp}] ", style="dim")
+            output.append(f"[{timestamp}] ", style=_STYLES["segment.time"])
         
         if copied:
-            output.append("📋 ", style="green")
+            output.append("📋 ", style=_STYLES["segment.copied"])
         
-        output.append(text, style="white")
+        output.append(text, style=_STYLES["segment.text"])
         
         self.console.print(output)
     
@@ -702,35 +994,41 @@ class RichConsoleUI:
         table.add_column("Время", style="dim", width=10)
         table.add_column("Текст", style="white")
         
+        # Распознанный текст выводим как Text — без разбора Rich-разметки
         for timestamp, text in self.segments:
-            table.add_row(timestamp, text)
+            table.add_row(timestamp, Text(text))
         
         self.console.print(table)
+        if self.segments_dropped:
+            self.print_warning(
+                f"Показаны последние {len(self.segments)} сегментов "
+                f"(ранних отброшено: {self.segments_dropped})"
+            )
         
         # Полный текст
         full_text = " ".join(t for _, t in self.segments)
         self.console.print()
         self.console.print(Panel(
-            full_text,
+            Text(full_text),
             title="[bold]Объединённый текст[/bold]",
             border_style="cyan"
         ))
     
     def print_success(self, message: str):
         """Выводит сообщение об успехе."""
-        self.console.print(f"[green]✅ {message}[/green]")
+        self.console.print(Text(f"✅ {message}", style=_STYLES["msg.success"]))
     
     def print_error(self, message: str):
         """Выводит сообщение об ошибке."""
-        self.console.print(f"[red]❌ {message}[/red]")
+        self.console.print(Text(f"❌ {message}", style=_STYLES["msg.error"]))
     
     def print_warning(self, message: str):
         """Выводит предупреждение."""
-        self.console.print(f"[yellow]⚠️ {message}[/yellow]")
+        self.console.print(Text(f"⚠️ {message}", style=_STYLES["msg.warning"]))
     
     def print_info(self, message: str):
         """Выводит информационное сообщение."""
-        self.console.print(f"[cyan]ℹ️ {message}[/cyan]")
+        self.console.print(Text(f"ℹ️ {message}", style=_STYLES["msg.info"]))
 
 
 # Fallback для систем без Rich
@@ -741,10 +1039,14 @@ class SimpleConsoleUI:
         self.is_recording = False
         self.audio_level = 0.0
         self.current_text = ""
-        self.segments = []
+        self.segments = deque(maxlen=_MAX_SEGMENTS)
+        self.segments_dropped = 0
         self.device_name = ""
         self.mode = "continuous"
         self._last_line_len = 0
+        # Строку статуса имеет смысл перерисовывать только в терминале
+        self._interactive = getattr(sys.stdout, "isatty", lambda: False)()
+        self._last_status = None  # Последняя выведенная строка статуса
     
     def print_banner(self):
         print("\n" + "=" * 45)
@@ -777,23 +1079,34 @@ class SimpleConsoleUI:
         if recording is not None:
             self.is_recording = recording
         
+        # Вывод перенаправлен в файл/канал — строка статуса с \r там не видна
+        if not self._interactive:
+            return
+        
         # Формируем строку
-        bars = int(self.audio_level * 10)
-        level_str = "▓" * min(bars, 10) + "░" * max(0, 10 - bars)
+        level_str = simple_level_bar(int(self.audio_level * _SIMPLE_BAR_CELLS))
         
-        status = "🔴 REC" if self.is_recording else "⚪ READY"
+        status = _SIMPLE_STATUS[bool(self.is_recording)]
         output = f"\r{status} [{level_str}] {self.current_text[:60]:<60}"
         
+        # Ничего не изменилось на экране — не перерисовываем
+        if output == self._last_status:
+            return
+        self._last_status = output
+        
         print(output, end="", flush=True)
     
     def add_segment(self, text: str):
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        if len(self.segments) == self.segments.maxlen:
+            self.segments_dropped += 1
+        timestamp = _now_hms()
         self.segments.append((timestamp, text))
     
     def print_segment(self, text: str, copied: bool = False):
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = _now_hms()
         prefix = "📋 " if copied else ""
         print(f"\n[{timestamp}] {prefix}{text}")
+        self._last_status = None
     
     def print_final_transcript(self):
         if not self.segments:
@@ -804,18 +1117,25 @@ class SimpleConsoleUI:
         for timestamp, text in self.segments:
             print(f"[{timestamp}] {text}")
         print("=" * 50)
+        if self.segments_dropped:
+            print(f"⚠️ Показаны последние {len(self.segments)} сегментов "
+                  f"(ранних отброшено: {self.segments_dropped})")
     
     def print_success(self, message: str):
         print(f"✅ {message}")
+        self._last_status = None
     
     def print_error(self, message: str):
         print(f"❌ {message}")
+        self._last_status = None
     
     def print_warning(self, message: str):
         print(f"⚠️ {message}")
+        self._last_status = None
     
     def print_info(self, message: str):
         print(f"ℹ️ {message}")
+        self._last_status = None
 
 
 def get_console_ui(**kwargs):